@@ -0,0 +1,158 @@
+"""
+Shared GraphQL client for CRM cron jobs and Celery tasks
+"""
+import json
+import os
+import requests
+from gql import Client
+from gql.transport.exceptions import TransportProtocolError, TransportQueryError
+from gql.transport.requests import RequestsHTTPTransport
+from graphql import print_ast
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # orjson is optional; the stdlib decoder also accepts bytes
+    from json import loads as _loads
+
+GRAPHQL_URL = "http://localhost:8000/graphql"
+GRAPHQL_BATCH_URL = "http://localhost:8000/graphql/batch"
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Same retry policy RequestsHTTPTransport(retries=...) would mount by default
+RETRIES = 1
+RETRY_BACKOFF_FACTOR = 0.1
+RETRY_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+
+_session = None
+_http_session = None
+
+
+def _validate_schema():
+    """
+    Introspecting the schema costs one extra round-trip per process, i.e. per
+    cron run, so it is off unless CRM_GQL_VALIDATE_SCHEMA=1 is set in development.
+    """
+    return os.environ.get('CRM_GQL_VALIDATE_SCHEMA') == '1'
+
+
+def _pooled_adapter():
+    """
+    HTTPAdapter sized so each concurrent Celery worker thread gets a ready
+    socket, keeping the transport's retry policy (backoff, status codes, POST).
+    """
+    retry = Retry(
+        total=RETRIES,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_FORCELIST,
+        allowed_methods=None,
+    )
+    return HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+
+
+def get_client():
+    """
+    Return a process-wide GraphQL session bound to a keep-alive HTTP connection.
+    The client is built on first use and reused by every later call, so the
+    TCP handshake is paid once per process instead of once per job.
+    """
+    global _session
+
+    if _session is None:
+        transport = RequestsHTTPTransport(
+            url=GRAPHQL_URL,
+            retries=RETRIES,
+            retry_backoff_factor=RETRY_BACKOFF_FACTOR,
+            retry_status_forcelist=RETRY_STATUS_FORCELIST,
+        )
+        client = Client(transport=transport, fetch_schema_from_transport=_validate_schema())
+
+        # connect_sync() keeps the transport open across execute() calls
+        session = client.connect_sync()
+
+        # Replaces the transport's default adapter with a larger pool
+        adapter = _pooled_adapter()
+        transport.session.mount('http://', adapter)
+        transport.session.mount('https://', adapter)
+
+        _session = session
+
+    return _session
+
+
+def encode_query(document):
+    """Serialize a GraphQL document once into a ready-to-send request body."""
+    return json.dumps({"query": print_ast(document)}).encode()
+
+
+def encode_batch(documents):
+    """Serialize several GraphQL documents into one batch request body."""
+    return json.dumps([{"query": print_ast(document)} for document in documents]).encode()
+
+
+def _result_data(entry):
+    """Return the data of one GraphQL response, raising on errors like gql does."""
+    if entry.get('errors'):
+        raise TransportQueryError(
+            str(entry['errors'][0]),
+            errors=entry['errors'],
+            data=entry.get('data'),
+        )
+    return entry.get('data') or {}
+
+
+def _get_http_session():
+    """Return the process-wide keep-alive session used for pre-encoded requests."""
+    global _http_session
+
+    if _http_session is None:
+        session = requests.Session()
+        adapter = _pooled_adapter()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _http_session = session
+
+    return _http_session
+
+
+def _post(url, body):
+    """POST a pre-encoded JSON body and return the decoded response payload."""
+    response = _get_http_session().post(url, data=body, headers=_JSON_HEADERS)
+
+    try:
+        payload = _loads(response.content)
+    except ValueError:
+        # Not a GraphQL response at all (e.g. an HTML error page)
+        response.raise_for_status()
+        raise TransportProtocolError(f"Server did not return JSON: {response.text[:200]}")
+
+    # Request-level failures (bad body, bad query) come back as an error object
+    if response.status_code >= 400 and isinstance(payload, dict):
+        _result_data(payload)
+        response.raise_for_status()
+
+    return payload
+
+
+def post_query(body):
+    """
+    POST a body from encode_query() over a plain keep-alive requests session
+    and return its data, bypassing gql's client, transport and result parsing.
+    """
+    payload = _post(GRAPHQL_URL, body)
+    if not isinstance(payload, dict):
+        raise TransportProtocolError(f"Unexpected GraphQL response: {payload!r}")
+    return _result_data(payload)
+
+
+def post_batch(body):
+    """
+    POST a body from encode_batch() to the batch endpoint.
+    Operations run in order on the server; returns the data of each one.
+    """
+    payload = _post(GRAPHQL_BATCH_URL, body)
+    if not isinstance(payload, list):
+        raise TransportProtocolError(f"Unexpected batch response: {payload!r}")
+    return [_result_data(entry) for entry in payload]
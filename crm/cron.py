@@ -3,11 +3,52 @@ Django-crontab job definitions for CRM application
 """
 import os
 import django
+from django.apps import apps
 from datetime import datetime
+from gql import gql
 
-# Setup Django environment
+# Setup Django environment, unless the runner (manage.py, Celery worker) already did
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'graphql_crm.settings')
-django.setup()
+if not apps.ready:
+    django.setup()
+
+from crm._gql_client import encode_batch, encode_query, post_batch, post_query
+
+# Queries are parsed once at import instead of on every cron run
+HELLO_QUERY = gql("""
+    query {
+        hello
+    }
+""")
+
+LOW_STOCK_QUERY = gql("""
+    query {
+        lowStockProducts {
+            id
+            name
+            stock
+        }
+    }
+""")
+
+UPDATE_LOW_STOCK_MUTATION = gql("""
+    mutation {
+        updateLowStockProducts {
+            success
+            message
+            count
+            updatedProducts {
+                id
+                name
+                stock
+            }
+        }
+    }
+""")
+
+# Request bodies are serialized once and sent as-is on every run
+HELLO_BODY = encode_query(HELLO_QUERY)
+LOW_STOCK_BATCH_BODY = encode_batch([LOW_STOCK_QUERY, UPDATE_LOW_STOCK_MUTATION])
 
 
 def log_crm_heartbeat():
@@ -24,21 +65,7 @@ def log_crm_heartbeat():
     
     try:
         # Optional: Test GraphQL endpoint responsiveness
-        from gql import gql, Client
-        from gql.transport.requests import RequestsHTTPTransport
-        
-        # Setup GraphQL client
-        transport = RequestsHTTPTransport(url="http://localhost:8000/graphql")
-        client = Client(transport=transport, fetch_schema_from_transport=True)
-        
-        # Query the hello field
-        query = gql("""
-            query {
-                hello
-            }
-        """)
-        
-        result = client.execute(query)
+        result = post_query(HELLO_BODY)
         hello_response = result.get('hello', 'No response')
         
         # Enhanced message with GraphQL response
@@ -67,45 +94,9 @@ def updatelowstock():
     timestamp = datetime.now().strftime('%d/%m/%Y-%H:%M:%S')
     
     try:
-        # Import GraphQL client
-        from gql import gql, Client
-        from gql.transport.requests import RequestsHTTPTransport
-        
-        # Setup GraphQL client
-        transport = RequestsHTTPTransport(url="http://localhost:8000/graphql")
-        client = Client(transport=transport, fetch_schema_from_transport=True)
-        
-        # First, query products with stock < 10
-        query = gql("""
-            query {
-                lowStockProducts {
-                    id
-                    name
-                    stock
-                }
-            }
-        """)
-        
-        query_result = client.execute(query)
-        low_stock_products = query_result.get('lowStockProducts', [])
-        
-        # Execute UpdateLowStockProducts mutation to increment stock by 10
-        mutation = gql("""
-            mutation {
-                updateLowStockProducts {
-                    success
-                    message
-                    count
-                    updatedProducts {
-                        id
-                        name
-                        stock
-                    }
-                }
-            }
-        """)
-        
-        result = client.execute(mutation)
+        # Query products with stock < 10, then run UpdateLowStockProducts
+        # to increment their stock by 10, both in one batched request
+        _, result = post_batch(LOW_STOCK_BATCH_BODY)
         mutation_result = result.get('updateLowStockProducts', {})
         
         # Log the results
@@ -124,11 +115,9 @@ def updatelowstock():
         else:
             log_entries.append("No products were updated")
         
-        # Write to log file
-        with open('/tmp/lowstockupdates_log.txt', 'a') as log_file:
-            for entry in log_entries:
-                log_file.write(entry + '\n')
-            log_file.write('\n')  # Add blank line for readability
+        # Write to log file in a single call, followed by a blank line for readability
+        with open('/tmp/lowstockupdates_log.txt', 'a', buffering=8192) as log_file:
+            log_file.write('\n'.join(log_entries) + '\n\n')
             
     except Exception as e:
         # Log errors
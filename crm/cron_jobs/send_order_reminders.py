@@ -7,60 +7,64 @@ and logs reminders for processing.
 import os
 import sys
 from datetime import datetime, timedelta
-from gql import gql, Client
-from gql.transport.requests import RequestsHTTPTransport
+from gql import gql
+
+# Make the project root importable when run directly from crontab
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from crm._gql_client import get_client
+
+# GraphQL query to get orders from the last 7 days
+RECENT_ORDERS_QUERY = gql("""
+    query GetRecentOrders($orderDateGte: DateTime!) {
+        filteredOrders(filter: { orderDateGte: $orderDateGte }) {
+            id
+            orderDate
+            customer {
+                email
+            }
+        }
+    }
+""")
 
 def main():
     """Main function to process order reminders"""
     
+    # Read the clock once; the cutoff and every log line derive from it
+    now = datetime.now()
+    timestamp = now.strftime('%Y-%m-%d %H:%M:%S')
+    
     # Calculate date 7 days ago
-    seven_days_ago = datetime.now() - timedelta(days=7)
+    seven_days_ago = now - timedelta(days=7)
     seven_days_ago_str = seven_days_ago.strftime('%Y-%m-%dT%H:%M:%S')
     
     # Setup GraphQL client
-    transport = RequestsHTTPTransport(url="http://localhost:8000/graphql")
-    client = Client(transport=transport, fetch_schema_from_transport=True)
-    
-    # GraphQL query to get orders from the last 7 days
-    query = gql("""
-        query GetRecentOrders($orderDateGte: DateTime!) {
-            filteredOrders(filter: { orderDateGte: $orderDateGte }) {
-                id
-                orderDate
-                customer {
-                    email
-                }
-            }
-        }
-    """)
+    client = get_client()
     
     try:
         # Execute the query
         variables = {"orderDateGte": seven_days_ago_str}
-        result = client.execute(query, variable_values=variables)
-        
-        # Get current timestamp for logging
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        result = client.execute(RECENT_ORDERS_QUERY, variable_values=variables)
         
         # Process orders and log reminders
         orders = result.get('filteredOrders', [])
         
-        with open('/tmp/order_reminders_log.txt', 'a') as log_file:
-            if orders:
-                for order in orders:
-                    order_id = order['id']
-                    customer_email = order['customer']['email']
-                    log_entry = f"[{timestamp}] Order ID: {order_id}, Customer Email: {customer_email}\n"
-                    log_file.write(log_entry)
-            else:
-                log_entry = f"[{timestamp}] No recent orders found for reminders\n"
-                log_file.write(log_entry)
+        if orders:
+            payload = ''.join(
+                f"[{timestamp}] Order ID: {order['id']}, Customer Email: {order['customer']['email']}\n"
+                for order in orders
+            )
+        else:
+            payload = f"[{timestamp}] No recent orders found for reminders\n"
+        
+        # Write all reminders in a single call
+        with open('/tmp/order_reminders_log.txt', 'a', buffering=8192) as log_file:
+            log_file.write(payload)
         
         print("Order reminders processed!")
         
     except Exception as e:
         # Log errors
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         with open('/tmp/order_reminders_log.txt', 'a') as log_file:
             log_file.write(f"[{timestamp}] ERROR: {str(e)}\n")
         print(f"Error processing order reminders: {e}")
@@ -1,15 +1,19 @@
 import graphene
 from graphene_django import DjangoObjectType
 from graphene import relay
+from graphene.utils.str_converters import to_camel_case
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Count, F, Sum
 from django.utils import timezone
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
 from decimal import Decimal
 from graphene_django.filter import DjangoFilterConnectionField
-from graphql import GraphQLError
+from graphql import FieldNode, GraphQLError
 from .filters import CustomerFilter, ProductFilter, OrderFilter
 from .models import Customer, Product, Order
+from .signals import bump_stats_version, stats_cache_key
 
 # ==============================
 # GraphQL Types
@@ -32,6 +36,24 @@ class OrderType(DjangoObjectType):
         model = Order
         interfaces = (relay.Node,)
 
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        # Join and prefetch only the relations the query selects
+        selected = selected_fields(info)
+        if selected is not None and 'edges' in selected:
+            selected = selected_fields(info, 'edges', 'node')
+        if selected is None or 'customer' in selected:
+            queryset = queryset.select_related('customer')
+        if selected is None or 'products' in selected:
+            queryset = queryset.prefetch_related('products')
+        return queryset
+
+
+class CRMStatsType(graphene.ObjectType):
+    total_customers = graphene.Int()
+    total_orders = graphene.Int()
+    total_revenue = graphene.Decimal()
+
 
 # ==============================
 # Input Types
@@ -94,24 +116,32 @@ class BulkCreateCustomers(graphene.Mutation):
     def mutate(self, info, input):
         created = []
         errors = []
+
+        # Fetch every already-registered email in one query
+        emails = [cust.email for cust in input]
+        taken = set(Customer.objects.filter(email__in=emails).values_list('email', flat=True))
+
+        for i, cust in enumerate(input):
+            try:
+                validate_email(cust.email)
+            except ValidationError:
+                errors.append(f"Entry {i + 1}: Invalid email format.")
+                continue
+
+            if cust.email in taken:
+                errors.append(f"Entry {i + 1}: Email already exists.")
+                continue
+
+            taken.add(cust.email)  # also rejects duplicates within the batch
+            created.append(Customer(
+                name=cust.name,
+                email=cust.email,
+                phone=cust.phone or ''
+            ))
+
         with transaction.atomic():
-            for i, cust in enumerate(input):
-                try:
-                    validate_email(cust.email)
-                    if Customer.objects.filter(email=cust.email).exists():
-                        raise GraphQLError("Email already exists.")
-
-                    customer = Customer(
-                        name=cust.name,
-                        email=cust.email,
-                        phone=cust.phone or ''
-                    )
-                    customer.save()  # explicitly called
-                    created.append(customer)
-                except ValidationError:
-                    errors.append(f"Entry {i + 1}: Invalid email format.")
-                except Exception as e:
-                    errors.append(f"Entry {i + 1}: {str(e)}")
+            Customer.objects.bulk_create(created, batch_size=500)
+            bump_stats_version()
 
         return BulkCreateCustomers(customers=created, errors=errors)
 
@@ -152,25 +182,126 @@ class CreateOrder(graphene.Mutation):
         except ObjectDoesNotExist:
             raise GraphQLError("Invalid customer ID.")
 
-        products = Product.objects.filter(id__in=input.product_ids)
-        if not products.exists():
+        # One query for (id, price) pairs; no Product models are loaded
+        rows = list(Product.objects.filter(id__in=input.product_ids).values_list('id', 'price'))
+        if not rows:
             raise GraphQLError("No valid products found for order.")
 
-        if products.count() != len(input.product_ids):
+        if len(rows) != len(set(input.product_ids)):
             raise GraphQLError("Some product IDs are invalid.")
 
-        total_amount = sum([product.price for product in products])
+        total_amount = sum(price for _, price in rows)
         order = Order(
             customer=customer,
             order_date=input.order_date or timezone.now(),
             total_amount=total_amount
         )
         order.save()  # explicitly called
-        order.products.set(products)
+        order.products.set(input.product_ids)
 
         return CreateOrder(order=order)
 
 
+class UpdateLowStockProducts(graphene.Mutation):
+    """
+    Mutation to update products with low stock (stock < 10).
+    Increments their stock by 10 to simulate restocking.
+    """
+
+    class Arguments:
+        pass  # No input arguments needed
+
+    updated_products = graphene.List(ProductType)
+    message = graphene.String()
+    success = graphene.Boolean()
+    count = graphene.Int()
+
+    def mutate(self, info):
+        try:
+            with transaction.atomic():
+                # Lock the products with stock < 10 and restock them in one UPDATE
+                low_stock_ids = list(
+                    Product.objects.select_for_update()
+                    .filter(stock__lt=10)
+                    .values_list('id', flat=True)
+                )
+
+                if not low_stock_ids:
+                    return UpdateLowStockProducts(
+                        updated_products=[],
+                        message="No low stock products found",
+                        success=True,
+                        count=0
+                    )
+
+                Product.objects.filter(id__in=low_stock_ids).update(stock=F('stock') + 10)
+
+            # Load only the columns selected under updatedProducts
+            queryset = Product.objects.filter(id__in=low_stock_ids)
+            fields = fields_from_info(info, Product, 'updatedProducts')
+            updated_products = list(queryset.only(*fields) if fields else queryset)
+            count = len(updated_products)
+
+            return UpdateLowStockProducts(
+                updated_products=updated_products,
+                message=f"Successfully updated {count} low stock products by adding 10 units each",
+                success=True,
+                count=count
+            )
+
+        except Exception as e:
+            return UpdateLowStockProducts(
+                updated_products=[],
+                message=f"Error updating low stock products: {str(e)}",
+                success=False,
+                count=0
+            )
+
+
+def selected_fields(info, *path):
+    """
+    Return the names of the fields selected on the current GraphQL field,
+    after descending into the nested fields named by path (e.g. 'edges',
+    'node'). Returns None when the selection uses fragments.
+    """
+    selection_set = info.field_nodes[0].selection_set
+    for name in (*path, None):
+        if selection_set is None:
+            return set()
+        if not all(isinstance(selection, FieldNode) for selection in selection_set.selections):
+            return None
+        selections = {selection.name.value: selection for selection in selection_set.selections}
+        if name is None:
+            return set(selections)
+        selection_set = selections[name].selection_set if name in selections else None
+
+
+def fields_from_info(info, model, *path):
+    """
+    Map the fields selected in the current GraphQL query to model columns for
+    QuerySet.only(), descending into path first (see selected_fields).
+    Returns None when the selection uses fragments, in which case all columns
+    should be loaded.
+    """
+    selected = selected_fields(info, *path)
+    if selected is None:
+        return None
+    columns = {to_camel_case(f.name): f.name for f in model._meta.concrete_fields}
+    fields = {model._meta.pk.name}
+    fields.update(columns[name] for name in selected if name in columns)
+    return sorted(fields)
+
+
+def compute_crm_stats():
+    """Aggregate customer and order totals for crmStats"""
+    orders = Order.objects.aggregate(n=Count('id'), revenue=Sum('total_amount'))
+    return {
+        'total_customers': Customer.objects.count(),
+        'total_orders': orders['n'],
+        'total_revenue': orders['revenue'] or Decimal("0.00"),
+    }
+
+
 # ==============================
 # Main Mutation & Query classes
 # ==============================
@@ -180,6 +311,7 @@ class Mutation(graphene.ObjectType):
     bulk_create_customers = BulkCreateCustomers.Field()
     create_product = CreateProduct.Field()
     create_order = CreateOrder.Field()
+    update_low_stock_products = UpdateLowStockProducts.Field()
 
 
 class Query(graphene.ObjectType):
@@ -187,6 +319,18 @@ class Query(graphene.ObjectType):
     all_customers = DjangoFilterConnectionField(CustomerType, filterset_class=CustomerFilter)
     all_products = DjangoFilterConnectionField(ProductType, filterset_class=ProductFilter)
     all_orders = DjangoFilterConnectionField(OrderType, filterset_class=OrderFilter)
+    crm_stats = graphene.Field(CRMStatsType)
+    low_stock_products = graphene.List(ProductType)
 
     def resolve_hello(self, info):
         return "Hello, GraphQL!"
+
+    def resolve_crm_stats(self, info):
+        # Cached per data version, so any customer/order write invalidates it
+        stats = cache.get_or_set(stats_cache_key(), compute_crm_stats, 60)
+        return CRMStatsType(**stats)
+
+    def resolve_low_stock_products(self, info):
+        queryset = Product.objects.filter(stock__lt=10)
+        fields = fields_from_info(info, Product)
+        return queryset.only(*fields) if fields else queryset
@@ -84,6 +84,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests instead of reconnecting each time
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -155,4 +158,12 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'crm.tasks.generatecrmreport',
         'schedule': crontab(day_of_week='mon', hour=6, minute=0),
     },
-}
\ No newline at end of file
+}
+
+# Cache Configuration (shared with cron jobs and Celery workers)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://localhost:6379/1',
+    }
+}
@@ -0,0 +1,39 @@
+"""
+Cache invalidation signals for CRM application
+"""
+import logging
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Customer, Order
+
+logger = logging.getLogger(__name__)
+
+STATS_VERSION_KEY = 'gql:crm_stats:version'
+
+
+def stats_cache_key():
+    """Return the crmStats cache key for the current data version."""
+    version = cache.get_or_set(STATS_VERSION_KEY, 1, None)
+    return f"gql:crm_stats:{version}"
+
+
+def bump_stats_version():
+    """
+    Invalidate cached crmStats by moving to a new data version.
+    Call this after bulk writes, which do not send model signals.
+    """
+    try:
+        cache.add(STATS_VERSION_KEY, 1, None)
+        cache.incr(STATS_VERSION_KEY)
+    except Exception:
+        # A cache outage must not fail the write; stats expire within their TTL
+        logger.exception("Failed to invalidate cached crmStats")
+
+
+@receiver([post_save, post_delete], sender=Customer)
+@receiver([post_save, post_delete], sender=Order)
+def invalidate_crm_stats(sender, **kwargs):
+    bump_stats_version()
@@ -3,12 +3,29 @@ Celery tasks for CRM application
 """
 import os
 import django
+from django.apps import apps
 from datetime import datetime
 from celery import shared_task
+from gql import gql
 
-# Setup Django environment
+# Setup Django environment, unless the runner (manage.py, Celery worker) already did
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'graphql_crm.settings')
-django.setup()
+if not apps.ready:
+    django.setup()
+
+from crm._gql_client import encode_query, post_query
+
+# Parsed once at import instead of on every report run
+CRM_STATS_QUERY = gql("""
+    query GetCRMStats {
+        crmStats {
+            totalCustomers
+            totalOrders
+            totalRevenue
+        }
+    }
+""")
+CRM_STATS_BODY = encode_query(CRM_STATS_QUERY)
 
 
 @shared_task
@@ -18,36 +35,15 @@ def generatecrmreport():
     Fetches total customers, orders, and revenue, then logs to file.
     """
     try:
-        # Import GraphQL client
-        from gql import gql, Client
-        from gql.transport.requests import RequestsHTTPTransport
-        
-        # Setup GraphQL client
-        transport = RequestsHTTPTransport(url="http://localhost:8000/graphql")
-        client = Client(transport=transport, fetch_schema_from_transport=True)
-        
         # Query for CRM statistics
-        query = gql("""
-            query GetCRMStats {
-                customers {
-                    id
-                }
-                orders {
-                    id
-                    totalAmount
-                }
-            }
-        """)
-        
-        result = client.execute(query)
+        result = post_query(CRM_STATS_BODY)
         
-        # Calculate statistics
-        customers = result.get('customers', [])
-        orders = result.get('orders', [])
+        # Statistics are aggregated server-side
+        stats = result.get('crmStats') or {}
         
-        total_customers = len(customers)
-        total_orders = len(orders)
-        total_revenue = sum(float(order.get('totalAmount', 0)) for order in orders)
+        total_customers = stats.get('totalCustomers', 0)
+        total_orders = stats.get('totalOrders', 0)
+        total_revenue = float(stats.get('totalRevenue') or 0)
         
         # Get current timestamp
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -1,3 +1,319 @@
-from django.test import TestCase
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from gql.transport.exceptions import TransportProtocolError, TransportQueryError
+from requests import HTTPError, Response
+
+from alx_backend_graphql.schema import schema
+
+from . import _gql_client
+from .models import Customer, Order, Product
+
+
+class GraphQLTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def execute(self, query):
+        result = schema.execute(query)
+        self.assertIsNone(result.errors)
+        return result.data
+
+
+class UpdateLowStockProductsTests(GraphQLTestCase):
+    MUTATION = '''
+        mutation {
+            updateLowStockProducts {
+                success
+                count
+                updatedProducts { name stock }
+            }
+        }
+    '''
+
+    def test_restocks_only_low_stock_products(self):
+        for name, stock in [('A', 2), ('B', 9), ('C', 10), ('D', 15)]:
+            Product.objects.create(name=name, price=Decimal('1.00'), stock=stock)
+
+        data = self.execute(self.MUTATION)['updateLowStockProducts']
+
+        self.assertTrue(data['success'])
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(
+            sorted((p['name'], p['stock']) for p in data['updatedProducts']),
+            [('A', 12), ('B', 19)],
+        )
+        self.assertEqual(
+            dict(Product.objects.values_list('name', 'stock')),
+            {'A': 12, 'B': 19, 'C': 10, 'D': 15},
+        )
+
+    def test_no_low_stock_products(self):
+        Product.objects.create(name='A', price=Decimal('1.00'), stock=10)
+
+        data = self.execute(self.MUTATION)['updateLowStockProducts']
+
+        self.assertEqual(data['count'], 0)
+        self.assertEqual(data['updatedProducts'], [])
+
+    def test_selected_columns_load_in_one_query(self):
+        for i in range(5):
+            Product.objects.create(name=f'P{i}', price=Decimal('2.50'), stock=i)
+
+        with self.assertNumQueries(5):
+            data = self.execute('''
+                mutation {
+                    updateLowStockProducts { updatedProducts { name stock price } }
+                }
+            ''')['updateLowStockProducts']
+
+        self.assertEqual(
+            sorted((p['name'], p['stock'], p['price']) for p in data['updatedProducts']),
+            [(f'P{i}', i + 10, '2.50') for i in range(5)],
+        )
+
+
+class OrderQueryCountTests(GraphQLTestCase):
+    def setUp(self):
+        super().setUp()
+        products = [Product.objects.create(name=f'P{i}', price=Decimal('1.00')) for i in range(2)]
+        for i in range(3):
+            customer = Customer.objects.create(name=f'C{i}', email=f'c{i}@example.com')
+            order = Order.objects.create(customer=customer, total_amount=Decimal('2.00'))
+            order.products.set(products)
+
+    def test_flat_orders_skip_unselected_relations(self):
+        # COUNT + orders
+        with self.assertNumQueries(2):
+            self.execute('{ allOrders { edges { node { id } } } }')
+
+    def test_nested_orders_skip_unselected_relations(self):
+        # COUNT + customers, then COUNT + orders per customer
+        with self.assertNumQueries(2 + 3 * 2):
+            self.execute('{ allCustomers { edges { node { orderSet { edges { node { id } } } } } } }')
+
+    def test_selected_relations_are_batched(self):
+        # COUNT + orders joined to customers + one products prefetch
+        with self.assertNumQueries(3):
+            data = self.execute('''
+                {
+                    allOrders {
+                        edges { node { customer { name } products { edges { node { name } } } } }
+                    }
+                }
+            ''')
+
+        self.assertEqual(len(data['allOrders']['edges']), 3)
+
+
+class CreateCustomerTests(GraphQLTestCase):
+    def test_phone_is_stored_as_given(self):
+        data = self.execute('''
+            mutation {
+                createCustomer(input: {name: "A", email: "a@example.com", phone: "(555) 123-4567"}) {
+                    customer { phone }
+                    message
+                }
+            }
+        ''')['createCustomer']
+
+        self.assertEqual(data['customer']['phone'], '(555) 123-4567')
+        self.assertEqual(data['message'], 'Customer created successfully.')
+
+
+class BulkCreateCustomersTests(GraphQLTestCase):
+    def test_partitions_valid_and_invalid_entries(self):
+        Customer.objects.create(name='Existing', email='taken@example.com')
+
+        data = self.execute('''
+            mutation {
+                bulkCreateCustomers(input: [
+                    {name: "Ok", email: "ok@example.com", phone: "(555) 123-4567"},
+                    {name: "Taken", email: "taken@example.com"},
+                    {name: "Again", email: "ok@example.com"},
+                    {name: "Bad email", email: "not-an-email"},
+                    {name: "Also ok", email: "also@example.com"}
+                ]) {
+                    customers { email phone }
+                    errors
+                }
+            }
+        ''')['bulkCreateCustomers']
+
+        self.assertEqual(data['customers'], [
+            {'email': 'ok@example.com', 'phone': '(555) 123-4567'},
+            {'email': 'also@example.com', 'phone': ''},
+        ])
+        self.assertEqual(data['errors'], [
+            'Entry 2: Email already exists.',
+            'Entry 3: Email already exists.',
+            'Entry 4: Invalid email format.',
+        ])
+        self.assertEqual(Customer.objects.count(), 3)
+
+    def test_lookup_and_insert_do_not_grow_with_batch_size(self):
+        entries = ', '.join(f'{{name: "C{i}", email: "c{i}@example.com"}}' for i in range(20))
+
+        # email IN lookup + savepoint, INSERT, release
+        with self.assertNumQueries(4):
+            data = self.execute(f'mutation {{ bulkCreateCustomers(input: [{entries}]) {{ errors }} }}')
+
+        self.assertEqual(data['bulkCreateCustomers']['errors'], [])
+        self.assertEqual(Customer.objects.count(), 20)
+
+
+
+class CreateOrderTests(GraphQLTestCase):
+    def setUp(self):
+        super().setUp()
+        self.customer = Customer.objects.create(name='Alice', email='alice@example.com')
+        self.laptop = Product.objects.create(name='Laptop', price=Decimal('999.99'), stock=5)
+        self.mouse = Product.objects.create(name='Mouse', price=Decimal('25.50'), stock=5)
+
+    def create_order(self, product_ids):
+        ids = ', '.join(f'"{pk}"' for pk in product_ids)
+        return schema.execute(f'''
+            mutation {{
+                createOrder(input: {{customerId: "{self.customer.id}", productIds: [{ids}]}}) {{
+                    order {{ totalAmount products {{ edges {{ node {{ name }} }} }} }}
+                }}
+            }}
+        ''')
+
+    def test_total_is_sum_of_product_prices(self):
+        result = self.create_order([self.laptop.id, self.mouse.id])
+
+        self.assertIsNone(result.errors)
+        order = result.data['createOrder']['order']
+        self.assertEqual(Decimal(order['totalAmount']), Decimal('1025.49'))
+        self.assertEqual(sorted(e['node']['name'] for e in order['products']['edges']), ['Laptop', 'Mouse'])
+
+    def test_duplicate_product_ids_are_accepted(self):
+        result = self.create_order([self.laptop.id, self.laptop.id])
+
+        self.assertIsNone(result.errors)
+        self.assertEqual(Decimal(result.data['createOrder']['order']['totalAmount']), Decimal('999.99'))
+
+    def test_invalid_product_id_is_rejected(self):
+        result = self.create_order([self.laptop.id, 0])
+
+        self.assertEqual(result.errors[0].message, 'Some product IDs are invalid.')
+        self.assertFalse(Order.objects.exists())
+
+
+class CRMStatsTests(GraphQLTestCase):
+    QUERY = '{ crmStats { totalCustomers totalOrders totalRevenue } }'
+
+    def stats(self):
+        return self.execute(self.QUERY)['crmStats']
+
+    def test_stats_refresh_after_create(self):
+        self.assertEqual(self.stats()['totalCustomers'], 0)
+
+        self.execute('mutation { createCustomer(input: {name: "A", email: "a@example.com"}) { message } }')
+
+        self.assertEqual(self.stats()['totalCustomers'], 1)
+
+    def test_stats_refresh_after_bulk_create(self):
+        self.assertEqual(self.stats()['totalCustomers'], 0)
+
+        self.execute('''
+            mutation {
+                bulkCreateCustomers(input: [
+                    {name: "A", email: "a@example.com"},
+                    {name: "B", email: "b@example.com"}
+                ]) { errors }
+            }
+        ''')
+
+        self.assertEqual(self.stats()['totalCustomers'], 2)
+
+    def test_stats_refresh_after_order(self):
+        customer = Customer.objects.create(name='A', email='a@example.com')
+        product = Product.objects.create(name='P', price=Decimal('10.00'))
+        self.assertEqual(self.stats()['totalOrders'], 0)
+
+        order = Order.objects.create(customer=customer, total_amount=product.price)
+
+        stats = self.stats()
+        self.assertEqual(stats['totalOrders'], 1)
+        self.assertEqual(Decimal(stats['totalRevenue']), Decimal('10.00'))
+
+        order.delete()
+        self.assertEqual(self.stats()['totalOrders'], 0)
+
+    def test_cache_errors_do_not_fail_writes(self):
+        with mock.patch.object(cache, 'incr', side_effect=ConnectionError('cache down')), \
+                self.assertLogs('crm.signals', 'ERROR'):
+            self.execute('mutation { createCustomer(input: {name: "A", email: "a@example.com"}) { message } }')
+
+        self.assertEqual(Customer.objects.count(), 1)
+
+
+class BatchEndpointTests(TestCase):
+    def test_runs_operations_in_order(self):
+        Product.objects.create(name='A', price=Decimal('1.00'), stock=3)
+
+        response = self.client.post(
+            '/graphql/batch',
+            json.dumps([
+                {'query': '{ lowStockProducts { name stock } }'},
+                {'query': 'mutation { updateLowStockProducts { count } }'},
+            ]),
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        first, second = response.json()
+        self.assertEqual(first['data']['lowStockProducts'], [{'name': 'A', 'stock': 3}])
+        self.assertEqual(second['data']['updateLowStockProducts']['count'], 1)
+
+
+class PostClientTests(SimpleTestCase):
+    def respond(self, status_code, content):
+        response = Response()
+        response.status_code = status_code
+        response._content = content
+        session = mock.Mock()
+        session.post.return_value = response
+        return mock.patch.object(_gql_client, '_get_http_session', return_value=session)
+
+    def test_post_query_returns_data(self):
+        with self.respond(200, b'{"data": {"hello": "Hello, GraphQL!"}}'):
+            self.assertEqual(_gql_client.post_query(b'{}'), {'hello': 'Hello, GraphQL!'})
+
+    def test_post_query_raises_graphql_errors(self):
+        with self.respond(200, b'{"data": null, "errors": [{"message": "boom"}]}'):
+            with self.assertRaisesRegex(TransportQueryError, 'boom'):
+                _gql_client.post_query(b'{}')
+
+    def test_error_object_on_4xx_surfaces_its_message(self):
+        with self.respond(400, b'{"errors": [{"message": "Must provide query string."}]}'):
+            with self.assertRaisesRegex(TransportQueryError, 'Must provide query string'):
+                _gql_client.post_batch(b'[]')
+
+    def test_non_json_error_page_raises_http_error(self):
+        with self.respond(502, b'<html>Bad Gateway</html>'):
+            with self.assertRaises(HTTPError):
+                _gql_client.post_query(b'{}')
+
+    def test_non_json_success_raises_protocol_error(self):
+        with self.respond(200, b'<html>ok</html>'):
+            with self.assertRaises(TransportProtocolError):
+                _gql_client.post_query(b'{}')
+
+    def test_wrong_response_shapes_raise_protocol_error(self):
+        with self.respond(200, b'[{"data": {}}]'):
+            with self.assertRaises(TransportProtocolError):
+                _gql_client.post_query(b'{}')
+        with self.respond(200, b'{"data": {}}'):
+            with self.assertRaises(TransportProtocolError):
+                _gql_client.post_batch(b'[]')
+
+    def test_post_batch_returns_data_in_order(self):
+        with self.respond(200, b'[{"data": {"a": 1}}, {"data": {"b": 2}}]'):
+            self.assertEqual(_gql_client.post_batch(b'[]'), [{'a': 1}, {'b': 2}])
 
-# Create your tests here.
@@ -16,10 +16,11 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path
-from graphene_django.views import GraphQLView
+from crm.views import CachedGraphQLView
 from django.views.decorators.csrf import csrf_exempt
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path("graphql/", csrf_exempt(GraphQLView.as_view(graphiql=True))),
+    path("graphql/", csrf_exempt(CachedGraphQLView.as_view(graphiql=True))),
+    path("graphql/batch/", csrf_exempt(CachedGraphQLView.as_view(batch=True))),
 ]
\ No newline at end of file
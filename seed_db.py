@@ -25,14 +25,18 @@ def seed_database():
         {"name": "David Wilson", "email": "david@example.com"},
     ]
 
-    customers = []
-    for data in customers_data:
-        customer, created = Customer.objects.get_or_create(
-            email=data['email'],
-            defaults=data
-        )
-        customers.append(customer)
-        if created:
+    # Look up existing customers once, then insert the rest in one query
+    emails = [data['email'] for data in customers_data]
+    existing_emails = set(Customer.objects.filter(email__in=emails).values_list('email', flat=True))
+    Customer.objects.bulk_create(
+        [Customer(**data) for data in customers_data if data['email'] not in existing_emails],
+        ignore_conflicts=True
+    )
+
+    by_email = Customer.objects.in_bulk(emails, field_name='email')
+    customers = [by_email[email] for email in emails]
+    for customer in customers:
+        if customer.email not in existing_emails:
             print(f"✅ Created customer: {customer.name}")
         else:
             print(f"ℹ️  Customer already exists: {customer.name}")
@@ -46,41 +50,50 @@ def seed_database():
         {"name": "Headphones", "price": 199.99, "stock": 25},
     ]
 
-    products = []
-    for data in products_data:
-        product, created = Product.objects.get_or_create(
-            name=data['name'],
-            defaults=data
-        )
-        products.append(product)
-        if created:
+    # Product names are not unique, so filter out existing ones explicitly
+    names = [data['name'] for data in products_data]
+    existing_names = set(Product.objects.filter(name__in=names).values_list('name', flat=True))
+    Product.objects.bulk_create(
+        [Product(**data) for data in products_data if data['name'] not in existing_names]
+    )
+
+    by_name = {product.name: product for product in Product.objects.filter(name__in=names)}
+    products = [by_name[name] for name in names]
+    for product in products:
+        if product.name not in existing_names:
             print(f"✅ Created product: {product.name}")
         else:
             print(f"ℹ️  Product already exists: {product.name}")
 
     # Create sample orders
     if customers and products:
-        # Order 1: Alice buys laptop and mouse
-        order1, created = Order.objects.get_or_create(
-            customer=customers[0],
-            defaults={}
-        )
-        if created:
-            order1.products.set([products[0], products[1]])  # Laptop + Mouse
-            order1.calculate_total()
-            order1.save()
-            print(f"✅ Created order for {customers[0].name}: ${order1.total_amount}")
-
-        # Order 2: Bob buys keyboard and headphones
-        order2, created = Order.objects.get_or_create(
-            customer=customers[1],
-            defaults={}
+        order_plan = [
+            (customers[0], [products[0], products[1]]),  # Alice: Laptop + Mouse
+            (customers[1], [products[2], products[4]]),  # Bob: Keyboard + Headphones
+        ]
+
+        # Only customers without an order yet get a sample order
+        ordered = set(
+            Order.objects.filter(customer__in=[customer for customer, _ in order_plan])
+            .values_list('customer_id', flat=True)
         )
-        if created:
-            order2.products.set([products[2], products[4]])  # Keyboard + Headphones
-            order2.calculate_total()
-            order2.save()
-            print(f"✅ Created order for {customers[1].name}: ${order2.total_amount}")
+        new_orders = [(customer, items) for customer, items in order_plan if customer.id not in ordered]
+
+        orders = Order.objects.bulk_create([
+            Order(customer=customer, total_amount=sum(product.price for product in items))
+            for customer, items in new_orders
+        ])
+
+        # Link all order products with a single insert into the M2M table
+        OrderProduct = Order.products.through
+        OrderProduct.objects.bulk_create([
+            OrderProduct(order_id=order.id, product_id=product.id)
+            for order, (_, items) in zip(orders, new_orders)
+            for product in items
+        ])
+
+        for order, (customer, _) in zip(orders, new_orders):
+            print(f"✅ Created order for {customer.name}: ${order.total_amount}")
 
     print("\nDatabase seeding completed!")
     print(f"Total customers: {Customer.objects.count()}")